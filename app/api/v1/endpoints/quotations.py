@@ -69,10 +69,12 @@ async def get_quotation_by_number(
 @router.get("/customers/{customer_id}/quotations")
 async def get_customer_quotations(
     customer_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    return QuotationService.get_quotations_by_customer(db, customer_id)
+    return QuotationService.get_quotations_by_customer(db, customer_id, skip, limit)
 
 
 @router.post("/quotations", response_model=QuotationResponse, status_code=status.HTTP_201_CREATED)
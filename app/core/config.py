@@ -22,3 +22,12 @@ DATABASE_URL = os.getenv(
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "300"))
+
+# ============================================================================
+# ORM CONFIGURATION
+# ============================================================================
+
+# When enabled, quotation read queries append raiseload("*") so any
+# relationship access not covered by an explicit eager load raises instead
+# of silently firing a lazy N+1 query. Intended for development/CI.
+STRICT_RELATIONSHIP_LOADING = os.getenv("STRICT_RELATIONSHIP_LOADING", "false").lower() in ("1", "true", "yes")
@@ -13,8 +13,21 @@ from app.core.config import DATABASE_URL
 # ENGINE & SESSION
 # ============================================================================
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    DATABASE_URL,
+    # Batch multi-row INSERT/UPDATE flushes into fewer round-trips
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    # Keep warm connections available under concurrent API traffic, and
+    # recycle/validate them so stale pooler connections never reach a request
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
+# expire_on_commit=False keeps committed instances readable without the
+# implicit re-SELECT that attribute access would otherwise trigger
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 
 # ============================================================================
@@ -8,7 +8,7 @@ from app.models.employee import Employee
 from app.models.customer import Customer
 from app.models.door_type import DoorType, DoorTypeThicknessOption, DoorTypeService
 from app.models.service import Service, ServiceOption, ServiceGrouping, ServiceGroupingChild
-from app.models.quotation import Quotation, QuotationItem, QuotationItemService, QuotationItemServiceUnitValue
+from app.models.quotation import Quotation, QuotationCounter, QuotationItem, QuotationItemService, QuotationItemServiceUnitValue
 from app.models.unit import Unit
 
 __all__ = [
@@ -17,6 +17,6 @@ __all__ = [
     "Customer",
     "DoorType", "DoorTypeThicknessOption", "DoorTypeService",
     "Service", "ServiceOption", "ServiceGrouping", "ServiceGroupingChild",
-    "Quotation", "QuotationItem", "QuotationItemService", "QuotationItemServiceUnitValue",
+    "Quotation", "QuotationCounter", "QuotationItem", "QuotationItemService", "QuotationItemServiceUnitValue",
     "Unit",
 ]
@@ -33,7 +33,7 @@ class DoorTypeThicknessOption(Base):
     __tablename__ = 'door_type_thickness_option'
 
     id = Column(Integer, primary_key=True)
-    door_type_id = Column(Integer, ForeignKey('door_type.id'), nullable=False)
+    door_type_id = Column(Integer, ForeignKey('door_type.id'), nullable=False, index=True)
 
     thickness_value = Column(Float, nullable=False)
     cost_per_sqft = Column(Float, nullable=False)
@@ -54,7 +54,7 @@ class DoorTypeService(Base):
 
     id = Column(Integer, primary_key=True)
 
-    door_type_id = Column(Integer, ForeignKey('door_type.id', ondelete='CASCADE'), nullable=False)
+    door_type_id = Column(Integer, ForeignKey('door_type.id', ondelete='CASCADE'), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey('service.id'), nullable=True)
     grouping_id = Column(Integer, ForeignKey('service_grouping.id'), nullable=True)
 
@@ -4,6 +4,7 @@ Quotation, QuotationItem, QuotationItemService, QuotationItemServiceUnitValue
 """
 
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Date, Text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import date
 from app.models.base import Base
@@ -14,7 +15,7 @@ class Quotation(Base):
     __tablename__ = 'quotation'
 
     id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey('customer_details.id'), nullable=False)
+    customer_id = Column(Integer, ForeignKey('customer_details.id'), nullable=False, index=True)
 
     date = Column(Date, nullable=False, default=date.today)
     status = Column(String, default='draft')
@@ -33,11 +34,24 @@ class Quotation(Base):
     items = relationship('QuotationItem', back_populates='quotation', cascade="all, delete-orphan")
 
 
+class QuotationCounter(Base):
+    """Per-year sequence backing quotation number generation.
+
+    A single row per year is incremented atomically (INSERT ... ON CONFLICT
+    DO UPDATE ... RETURNING), so concurrent creates can never derive the
+    same quotation number.
+    """
+    __tablename__ = 'quotation_counter'
+
+    year = Column(Integer, primary_key=True)
+    last_seq = Column(Integer, nullable=False, default=0)
+
+
 class QuotationItem(Base):
     __tablename__ = 'quotation_item'
 
     id = Column(Integer, primary_key=True)
-    quotation_id = Column(Integer, ForeignKey('quotation.id'), nullable=False)
+    quotation_id = Column(Integer, ForeignKey('quotation.id'), nullable=False, index=True)
     door_type_id = Column(Integer, ForeignKey('door_type.id'), nullable=False)
     thickness_option_id = Column(Integer, ForeignKey('door_type_thickness_option.id'), nullable=False)
 
@@ -62,6 +76,11 @@ class QuotationItem(Base):
     created_at = Column(DateTime, default=now_ist)
     updated_at = Column(DateTime, default=now_ist, onupdate=now_ist)
 
+    @hybrid_property
+    def area_sqft(self):
+        """Door area in square feet (dimensions are stored in inches)."""
+        return (self.length * self.breadth) / 144.0
+
     # Relationships
     quotation = relationship('Quotation', back_populates='items')
     door_type = relationship('DoorType', back_populates='items')
@@ -73,7 +92,7 @@ class QuotationItemService(Base):
     __tablename__ = 'quotation_item_service'
 
     id = Column(Integer, primary_key=True)
-    quotation_item_id = Column(Integer, ForeignKey('quotation_item.id'), nullable=False)
+    quotation_item_id = Column(Integer, ForeignKey('quotation_item.id'), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey('service.id'), nullable=False)
     parent_id = Column(Integer, ForeignKey('quotation_item_service.id'), nullable=True)
     option_id = Column(Integer, ForeignKey('service_option.id'), nullable=True)
@@ -101,7 +120,7 @@ class QuotationItemServiceUnitValue(Base):
     __tablename__ = 'quotation_item_service_unit_value'
 
     id = Column(Integer, primary_key=True)
-    quotation_item_service_id = Column(Integer, ForeignKey('quotation_item_service.id'), nullable=False)
+    quotation_item_service_id = Column(Integer, ForeignKey('quotation_item_service.id'), nullable=False, index=True)
     unit_id = Column(Integer, ForeignKey('unit.id'), nullable=False)
 
     value1 = Column(Float, nullable=True)
@@ -46,7 +46,7 @@ class ServiceOption(Base):
     __tablename__ = 'service_option'
 
     id = Column(Integer, primary_key=True)
-    service_id = Column(Integer, ForeignKey('service.id'), nullable=False)
+    service_id = Column(Integer, ForeignKey('service.id'), nullable=False, index=True)
 
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
@@ -86,7 +86,7 @@ class ServiceGroupingChild(Base):
     __tablename__ = 'service_grouping_child'
 
     id = Column(Integer, primary_key=True)
-    grouping_id = Column(Integer, ForeignKey('service_grouping.id'), nullable=False)
+    grouping_id = Column(Integer, ForeignKey('service_grouping.id'), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey('service.id'), nullable=False)
 
     required = Column(Boolean, default=False)
@@ -3,6 +3,7 @@ Customer Repository
 Data access layer for Customer entities.
 """
 
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -38,23 +39,26 @@ class CustomerRepository:
 
     @staticmethod
     def update_customer(db: Session, customer_id: int, data: CustomerUpdate, username: str = None) -> Optional[Customer]:
-        customer = db.query(Customer).filter(Customer.id == customer_id).first()
-        if not customer:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(customer, key, value)
         if username:
-            customer.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(Customer).filter(Customer.id == customer_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE + refresh
+        customer = db.execute(
+            update(Customer)
+            .where(Customer.id == customer_id)
+            .values(**update_data)
+            .returning(Customer)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(customer)
         return customer
 
     @staticmethod
     def delete_customer(db: Session, customer_id: int) -> bool:
-        customer = db.query(Customer).filter(Customer.id == customer_id).first()
-        if not customer:
-            return False
-        db.delete(customer)
+        # Single DELETE round-trip; rowcount distinguishes "not found"
+        rows = db.execute(
+            delete(Customer).where(Customer.id == customer_id)
+        ).rowcount
         db.commit()
-        return True
+        return rows > 0
@@ -3,6 +3,7 @@ Door Type Repository
 Data access layer for DoorType, ThicknessOption, and DoorTypeService entities.
 """
 
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
@@ -73,16 +74,19 @@ class DoorTypeRepository:
 
     @staticmethod
     def update_door_type(db: Session, door_type_id: int, data: DoorTypeUpdate, username: str = None) -> Optional[DoorType]:
-        door_type = db.query(DoorType).filter(DoorType.id == door_type_id).first()
-        if not door_type:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(door_type, key, value)
         if username:
-            door_type.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(DoorType).filter(DoorType.id == door_type_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        door_type = db.execute(
+            update(DoorType)
+            .where(DoorType.id == door_type_id)
+            .values(**update_data)
+            .returning(DoorType)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(door_type)
         return door_type
 
     @staticmethod
@@ -124,16 +128,19 @@ class DoorTypeRepository:
 
     @staticmethod
     def update_door_type_thickness_option(db: Session, option_id: int, data: DoorTypeThicknessOptionUpdate, username: str = None) -> Optional[DoorTypeThicknessOption]:
-        option = db.query(DoorTypeThicknessOption).filter(DoorTypeThicknessOption.id == option_id).first()
-        if not option:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(option, key, value)
         if username:
-            option.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(DoorTypeThicknessOption).filter(DoorTypeThicknessOption.id == option_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        option = db.execute(
+            update(DoorTypeThicknessOption)
+            .where(DoorTypeThicknessOption.id == option_id)
+            .values(**update_data)
+            .returning(DoorTypeThicknessOption)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(option)
         return option
 
     @staticmethod
@@ -181,23 +188,26 @@ class DoorTypeRepository:
 
     @staticmethod
     def update_door_type_service(db: Session, dts_id: int, data: DoorTypeServiceUpdate, username: str = None) -> Optional[DoorTypeService]:
-        dts = db.query(DoorTypeService).filter(DoorTypeService.id == dts_id).first()
-        if not dts:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(dts, key, value)
         if username:
-            dts.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(DoorTypeService).filter(DoorTypeService.id == dts_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        dts = db.execute(
+            update(DoorTypeService)
+            .where(DoorTypeService.id == dts_id)
+            .values(**update_data)
+            .returning(DoorTypeService)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(dts)
         return dts
 
     @staticmethod
     def delete_door_type_service(db: Session, dts_id: int) -> bool:
-        dts = db.query(DoorTypeService).filter(DoorTypeService.id == dts_id).first()
-        if not dts:
-            return False
-        db.delete(dts)
+        # Association row with no children: one DELETE, rowcount covers not-found
+        rows = db.execute(
+            delete(DoorTypeService).where(DoorTypeService.id == dts_id)
+        ).rowcount
         db.commit()
-        return True
+        return rows > 0
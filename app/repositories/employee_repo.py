@@ -19,7 +19,7 @@ class EmployeeRepository:
     def create_employee(db: Session, data: EmployeeCreate, username: str = None) -> Employee:
         hashed_password = get_password_hash(data.password)
         employee = Employee(
-            **data.dict(exclude="password"),
+            **data.model_dump(exclude={'password'}),
             hashed_password=hashed_password,
             created_by=username,
             updated_by=username
@@ -45,7 +45,7 @@ class EmployeeRepository:
                 detail="Employee not found"
             )
 
-        update_data = data.dict(exclude_unset=True)
+        update_data = data.model_dump(exclude_unset=True)
 
         # Handle password hashing if password is being updated
         if 'password' in update_data:
@@ -3,14 +3,17 @@ Quotation Repository
 Data access layer for Quotation, QuotationItem, and related entities.
 """
 
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, text, update
+from sqlalchemy.orm import Session, raiseload, selectinload
 from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import STRICT_RELATIONSHIP_LOADING
+
 from app.models import (
     Quotation, QuotationItem,
     QuotationItemService, QuotationItemServiceUnitValue,
-    Service, ServiceOption, DoorTypeThicknessOption, Unit
+    Service, ServiceOption, ServiceType, DoorTypeThicknessOption, Unit
 )
 from app.schemas.quotation import (
     QuotationCreate, QuotationUpdate,
@@ -19,41 +22,81 @@ from app.schemas.quotation import (
 )
 
 
+# Dimensions are stored in inches; divide square inches by this to get sq ft
+SQIN_PER_SQFT = 144.0
+
+
 class QuotationRepository:
 
     # ========================================================================
     # QUOTATION
     # ========================================================================
 
+    @staticmethod
+    def _load_service_cost_maps(db: Session, services_data: list) -> tuple:
+        """Batch-load the Service, ServiceOption, and Unit rows referenced by
+        the given service payloads — one IN query per table instead of one
+        query per row inside the cost loop."""
+        service_ids = {s.service_id for s in services_data}
+        option_ids = {s.option_id for s in services_data if s.option_id}
+        unit_ids = {uv.unit_id for s in services_data for uv in (s.unit_values or [])}
+
+        services_by_id = {
+            s.id: s for s in db.query(Service).filter(Service.id.in_(service_ids)).all()
+        } if service_ids else {}
+        options_by_id = {
+            o.id: o for o in db.query(ServiceOption).filter(ServiceOption.id.in_(option_ids)).all()
+        } if option_ids else {}
+        units_by_id = {
+            u.id: u for u in db.query(Unit).filter(Unit.id.in_(unit_ids)).all()
+        } if unit_ids else {}
+        return services_by_id, options_by_id, units_by_id
+
     @staticmethod
     def _calculate_service_cost(
         db: Session,
         svc_data: QuotationItemServiceCreate,
+        services_by_id: dict = None,
+        options_by_id: dict = None,
+        units_by_id: dict = None,
     ) -> float:
-        """Calculate cost for a single quotation item service."""
-        service = db.query(Service).filter(Service.id == svc_data.service_id).first()
+        """Calculate cost for a single quotation item service.
+
+        Lookup maps from _load_service_cost_maps avoid per-row queries;
+        when not supplied, rows are fetched individually.
+        """
+        if services_by_id is not None:
+            service = services_by_id.get(svc_data.service_id)
+        else:
+            service = db.query(Service).filter(Service.id == svc_data.service_id).first()
         if not service:
             return 0.0
 
         stype = service.service_type
-        stype_val = stype.value if hasattr(stype, 'value') else stype
+        stype_val = stype.value if isinstance(stype, ServiceType) else stype
 
-        # Determine base rate
-        rate = service.cost or 0.0
-        if svc_data.option_id:
-            option = db.query(ServiceOption).filter(ServiceOption.id == svc_data.option_id).first()
-            if option:
-                rate = option.cost or 0.0
-
-        # Direct amount overrides rate for all types
+        # Direct amount overrides the rate for all types, so only resolve
+        # the service/option rate when no override is given
         if svc_data.direct_amount is not None:
             rate = float(svc_data.direct_amount)
+        else:
+            rate = service.cost or 0.0
+            if svc_data.option_id:
+                if options_by_id is not None:
+                    option = options_by_id.get(svc_data.option_id)
+                else:
+                    option = db.query(ServiceOption).filter(ServiceOption.id == svc_data.option_id).first()
+                if option:
+                    rate = option.cost or 0.0
 
         cost = 0.0
         if stype_val == 'consumable':
             if svc_data.unit_values and len(svc_data.unit_values) > 0:
                 uv_data = svc_data.unit_values[0]
-                unit = db.query(Unit).filter(Unit.id == uv_data.unit_id).first()
+                if units_by_id is not None:
+                    unit = units_by_id.get(uv_data.unit_id)
+                else:
+                    unit = db.query(Unit).filter(Unit.id == uv_data.unit_id).first()
                 if unit and unit.unit_type and unit.unit_type.lower() == 'vector':
                     cost = rate * (uv_data.value1 or 0.0) * (uv_data.value2 or 0.0)
                 else:
@@ -62,10 +105,7 @@ class QuotationRepository:
                 quantity = svc_data.quantity or 0.0
                 cost = rate * quantity
 
-        elif stype_val == 'add_on':
-            cost = rate
-
-        elif stype_val == 'labour':
+        elif stype_val in ('add_on', 'labour'):
             cost = rate
 
         elif stype_val == 'grouping':
@@ -79,33 +119,52 @@ class QuotationRepository:
         return round(cost, 2)
 
     @staticmethod
-    def _calculate_item_costs(
-        db: Session,
-        item: QuotationItem,
-        thickness_option: DoorTypeThicknessOption,
-    ):
-        """Calculate and set cost breakdown fields on a QuotationItem."""
+    def _compute_item_costs(
+        length: float,
+        breadth: float,
+        cost_per_sqft: float,
+        quantity: int,
+        services_total: float,
+        discount: float,
+        tax_percent: float,
+    ) -> dict:
+        """Compute the cost breakdown columns for a quotation item.
+
+        Pure arithmetic — no session access — so callers can either assign
+        the result onto ORM instances or feed it to batched UPDATEs.
+        """
         # Base cost = area (sq ft) × cost_per_sqft × quantity
-        # Dimensions are stored in inches, so convert sq inches → sq feet (÷ 144)
-        area_sqft = (item.length * item.breadth) / 144
-        item.base_cost = round(area_sqft * thickness_option.cost_per_sqft * item.quantity, 2)
-
-        # Services cost = sum of all service costs
-        total_services = 0.0
-        for svc in item.services:
-            total_services += svc.cost or 0
-        item.services_cost = round(total_services * item.quantity, 2)
+        area_sqft = (length * breadth) / SQIN_PER_SQFT
+        base_cost = round(area_sqft * cost_per_sqft * quantity, 2)
+        services_cost = round(services_total * quantity, 2)
 
         # Linear cost flow
-        item.subtotal = round(item.base_cost + item.services_cost, 2)
-        item.total_after_discount = round(item.subtotal - (item.discount or 0), 2)
-        item.tax_amount = round(item.total_after_discount * ((item.tax_percent or 0) / 100), 2)
-        item.total = round(item.total_after_discount + item.tax_amount, 2)
+        subtotal = round(base_cost + services_cost, 2)
+        total_after_discount = round(subtotal - (discount or 0), 2)
+        tax_amount = round(total_after_discount * ((tax_percent or 0) / 100), 2)
+        total = round(total_after_discount + tax_amount, 2)
+
+        return {
+            'base_cost': base_cost,
+            'services_cost': services_cost,
+            'subtotal': subtotal,
+            'total_after_discount': total_after_discount,
+            'tax_amount': tax_amount,
+            'total': total,
+        }
+
+    @staticmethod
+    def _sum_item_totals(db: Session, quotation_id: int) -> float:
+        """Sum item totals for a quotation in the database."""
+        return db.query(
+            func.coalesce(func.sum(QuotationItem.total), 0.0)
+        ).filter(QuotationItem.quotation_id == quotation_id).scalar()
 
     @staticmethod
     def create_quotation(db: Session, data: QuotationCreate, username: str = None) -> Quotation:
         """Create a quotation with items and services, computing all costs."""
         quotation_number = QuotationRepository.generate_quotation_number(db)
+        actor = username or "system"
 
         quotation = Quotation(
             customer_id=data.customer_id,
@@ -114,8 +173,8 @@ class QuotationRepository:
             quotation_number=quotation_number,
             notes=data.notes,
             total=0,
-            created_by=username or "system",
-            updated_by=username or "system",
+            created_by=actor,
+            updated_by=actor,
         )
         db.add(quotation)
         db.flush()
@@ -123,14 +182,47 @@ class QuotationRepository:
         quotation_total = 0.0
 
         if data.items:
+            # Batch-load every Service/ServiceOption/Unit referenced by the
+            # payload up front (3 queries) instead of per service row.
+            all_services_data = [
+                svc_data
+                for item_data in data.items
+                for svc_data in (item_data.services or [])
+            ]
+            services_by_id, options_by_id, units_by_id = \
+                QuotationRepository._load_service_cost_maps(db, all_services_data)
+
+            # Batch-load the thickness options for base cost the same way
+            thickness_ids = {i.thickness_option_id for i in data.items}
+            thickness_by_id = {
+                t.id: t for t in db.query(DoorTypeThicknessOption).filter(
+                    DoorTypeThicknessOption.id.in_(thickness_ids)
+                ).all()
+            }
+
+            # Pass 1: compute service and item costs up front so each
+            # QuotationItem is constructed with its final cost columns —
+            # one INSERT per item, no follow-up UPDATE — then flush once
+            # so all item ids are assigned in a single round-trip
+            created_items = []
             for item_data in data.items:
-                # Get thickness option for base cost
-                thickness_option = db.query(DoorTypeThicknessOption).filter(
-                    DoorTypeThicknessOption.id == item_data.thickness_option_id
-                ).first()
+                thickness_option = thickness_by_id.get(item_data.thickness_option_id)
                 if not thickness_option:
                     raise ValueError(f"Thickness option {item_data.thickness_option_id} not found")
 
+                service_costs = [
+                    QuotationRepository._calculate_service_cost(
+                        db, svc_data, services_by_id, options_by_id, units_by_id
+                    )
+                    for svc_data in (item_data.services or [])
+                ]
+                costs = QuotationRepository._compute_item_costs(
+                    item_data.length, item_data.breadth, thickness_option.cost_per_sqft,
+                    item_data.quantity or 1, sum(service_costs),
+                    item_data.discount or 0, item_data.tax_percent or 0,
+                )
+                quotation_total += costs['total']
+
                 item = QuotationItem(
                     quotation_id=quotation.id,
                     door_type_id=item_data.door_type_id,
@@ -140,51 +232,46 @@ class QuotationRepository:
                     quantity=item_data.quantity or 1,
                     tax_percent=item_data.tax_percent or 0,
                     discount=item_data.discount or 0,
-                    created_by=username or "system",
-                    updated_by=username or "system",
+                    created_by=actor,
+                    updated_by=actor,
+                    **costs,
                 )
                 db.add(item)
-                db.flush()
-
-                # Process services
-                if item_data.services:
-                    for svc_data in item_data.services:
-                        cost = QuotationRepository._calculate_service_cost(db, svc_data)
-
-                        svc = QuotationItemService(
-                            quotation_item_id=item.id,
-                            service_id=svc_data.service_id,
-                            parent_id=svc_data.parent_id,
-                            option_id=svc_data.option_id,
-                            quantity=svc_data.quantity,
-                            direct_amount=svc_data.direct_amount,
-                            both_sides=svc_data.both_sides,
-                            cost=cost,
-                            created_by=username or "system",
-                            updated_by=username or "system",
-                        )
-                        db.add(svc)
-                        db.flush()
-
-                        # Unit values
-                        if svc_data.unit_values:
-                            for uv_data in svc_data.unit_values:
-                                uv = QuotationItemServiceUnitValue(
-                                    quotation_item_service_id=svc.id,
-                                    unit_id=uv_data.unit_id,
-                                    value1=uv_data.value1,
-                                    value2=uv_data.value2,
-                                )
-                                db.add(uv)
-
-                    db.flush()
-
-                # Refresh to get services list
-                db.refresh(item)
-
-                # Calculate item costs
-                QuotationRepository._calculate_item_costs(db, item, thickness_option)
-                quotation_total += item.total
+                created_items.append((item, item_data, service_costs))
+            db.flush()
+
+            # Pass 2: create every service row against the known item ids
+            # with the costs computed in pass 1; flush once to assign the
+            # service ids needed by unit values
+            created_services = []
+            for item, item_data, service_costs in created_items:
+                for svc_data, cost in zip(item_data.services or [], service_costs):
+                    svc = QuotationItemService(
+                        quotation_item_id=item.id,
+                        service_id=svc_data.service_id,
+                        parent_id=svc_data.parent_id,
+                        option_id=svc_data.option_id,
+                        quantity=svc_data.quantity,
+                        direct_amount=svc_data.direct_amount,
+                        both_sides=svc_data.both_sides,
+                        cost=cost,
+                        created_by=actor,
+                        updated_by=actor,
+                    )
+                    db.add(svc)
+                    created_services.append((svc, svc_data))
+            db.flush()
+
+            # Pass 3: unit values need no generated ids downstream, so the
+            # final commit flushes them
+            for svc, svc_data in created_services:
+                for uv_data in (svc_data.unit_values or []):
+                    db.add(QuotationItemServiceUnitValue(
+                        quotation_item_service_id=svc.id,
+                        unit_id=uv_data.unit_id,
+                        value1=uv_data.value1,
+                        value2=uv_data.value2,
+                    ))
 
         quotation.total = round(quotation_total, 2)
         db.commit()
@@ -193,8 +280,10 @@ class QuotationRepository:
         return QuotationRepository.get_quotation_by_id(db, quotation.id)
 
     @staticmethod
-    def get_quotation_by_id(db: Session, quotation_id: int) -> Optional[Quotation]:
-        return db.query(Quotation).options(
+    def _quotation_detail_options() -> list:
+        """Eager-load options covering everything QuotationResponse
+        serializes, shared by the detail getters so they stay in sync."""
+        options = [
             selectinload(Quotation.customer),
             selectinload(Quotation.items)
                 .selectinload(QuotationItem.door_type),
@@ -210,34 +299,47 @@ class QuotationRepository:
                 .selectinload(QuotationItem.services)
                 .selectinload(QuotationItemService.unit_values)
                 .selectinload(QuotationItemServiceUnitValue.unit),
+        ]
+        if STRICT_RELATIONSHIP_LOADING:
+            # Turn any uncovered lazy load into a loud error (dev/CI guard)
+            options.append(raiseload('*'))
+        return options
+
+    @staticmethod
+    def get_quotation_by_id(db: Session, quotation_id: int) -> Optional[Quotation]:
+        return db.query(Quotation).options(
+            *QuotationRepository._quotation_detail_options()
         ).filter(Quotation.id == quotation_id).first()
 
     @staticmethod
     def get_quotation_by_number(db: Session, quotation_number: str) -> Optional[Quotation]:
         return db.query(Quotation).options(
-            selectinload(Quotation.customer),
-            selectinload(Quotation.items)
-                .selectinload(QuotationItem.door_type),
-            selectinload(Quotation.items)
-                .selectinload(QuotationItem.thickness_option),
-            selectinload(Quotation.items)
-                .selectinload(QuotationItem.services)
-                .selectinload(QuotationItemService.service),
-            selectinload(Quotation.items)
-                .selectinload(QuotationItem.services)
-                .selectinload(QuotationItemService.selected_option),
+            *QuotationRepository._quotation_detail_options()
         ).filter(Quotation.quotation_number == quotation_number).first()
 
     @staticmethod
-    def get_quotations_by_customer(db: Session, customer_id: int) -> List[Quotation]:
-        return db.query(Quotation).options(
+    def _quotation_list_options() -> list:
+        """Eager-load options for list views, which only serialize the
+        customer besides the quotation's own columns."""
+        options = [
             selectinload(Quotation.customer),
-        ).filter(Quotation.customer_id == customer_id).all()
+        ]
+        if STRICT_RELATIONSHIP_LOADING:
+            options.append(raiseload('*'))
+        return options
+
+    @staticmethod
+    def get_quotations_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100) -> List[Quotation]:
+        return db.query(Quotation).options(
+            *QuotationRepository._quotation_list_options()
+        ).filter(Quotation.customer_id == customer_id).order_by(
+            Quotation.id.desc()
+        ).offset(skip).limit(limit).all()
 
     @staticmethod
     def get_all_quotations(db: Session, skip: int = 0, limit: int = 100) -> List[Quotation]:
         return db.query(Quotation).options(
-            selectinload(Quotation.customer),
+            *QuotationRepository._quotation_list_options()
         ).order_by(Quotation.id.desc()).offset(skip).limit(limit).all()
 
     @staticmethod
@@ -255,10 +357,24 @@ class QuotationRepository:
         if not quotation:
             return None
 
+        # Compute all item costs in memory, then flush them with a single
+        # executemany UPDATE instead of one UPDATE per dirty ORM row.
         quotation_total = 0.0
+        item_updates = []
         for item in quotation.items:
-            QuotationRepository._calculate_item_costs(db, item, item.thickness_option)
-            quotation_total += item.total
+            total_services = 0.0
+            for svc in item.services:
+                total_services += svc.cost or 0
+
+            costs = QuotationRepository._compute_item_costs(
+                item.length, item.breadth, item.thickness_option.cost_per_sqft,
+                item.quantity, total_services, item.discount, item.tax_percent,
+            )
+            quotation_total += costs['total']
+            item_updates.append({'id': item.id, **costs})
+
+        if item_updates:
+            db.execute(update(QuotationItem), item_updates)
 
         quotation.total = round(quotation_total, 2)
         db.commit()
@@ -266,16 +382,19 @@ class QuotationRepository:
 
     @staticmethod
     def update_quotation(db: Session, quotation_id: int, data: QuotationUpdate, updated_by: str = None) -> Optional[Quotation]:
-        quotation = db.query(Quotation).filter(Quotation.id == quotation_id).first()
-        if not quotation:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(quotation, key, value)
         if updated_by:
-            quotation.updated_by = updated_by
+            update_data['updated_by'] = updated_by
+        if not update_data:
+            return db.query(Quotation).filter(Quotation.id == quotation_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE + refresh
+        quotation = db.execute(
+            update(Quotation)
+            .where(Quotation.id == quotation_id)
+            .values(**update_data)
+            .returning(Quotation)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(quotation)
         return quotation
 
     @staticmethod
@@ -293,6 +412,7 @@ class QuotationRepository:
 
     @staticmethod
     def create_quotation_item(db: Session, data: QuotationItemCreate, created_by: str = None) -> QuotationItem:
+        actor = created_by or "system"
         item = QuotationItem(
             quotation_id=data.quotation_id,
             door_type_id=data.door_type_id,
@@ -302,8 +422,8 @@ class QuotationRepository:
             quantity=data.quantity or 1,
             tax_percent=data.tax_percent or 0,
             discount=data.discount or 0,
-            created_by=created_by or "system",
-            updated_by=created_by or "system",
+            created_by=actor,
+            updated_by=actor,
         )
         db.add(item)
         db.flush()
@@ -312,9 +432,20 @@ class QuotationRepository:
             DoorTypeThicknessOption.id == data.thickness_option_id
         ).first()
 
+        services_total = 0.0
         if data.services:
+            # Same batched lookup strategy as create_quotation: one IN query
+            # per referenced table, all service rows added before a single
+            # flush, then unit values attached to the flushed ids.
+            services_by_id, options_by_id, units_by_id = \
+                QuotationRepository._load_service_cost_maps(db, data.services)
+
+            created_services = []
             for svc_data in data.services:
-                cost = QuotationRepository._calculate_service_cost(db, svc_data)
+                cost = QuotationRepository._calculate_service_cost(
+                    db, svc_data, services_by_id, options_by_id, units_by_id
+                )
+                services_total += cost
                 svc = QuotationItemService(
                     quotation_item_id=item.id,
                     service_id=svc_data.service_id,
@@ -324,12 +455,14 @@ class QuotationRepository:
                     direct_amount=svc_data.direct_amount,
                     both_sides=svc_data.both_sides,
                     cost=cost,
-                    created_by=created_by or "system",
-                    updated_by=created_by or "system",
+                    created_by=actor,
+                    updated_by=actor,
                 )
                 db.add(svc)
-                db.flush()
+                created_services.append((svc, svc_data))
+            db.flush()
 
+            for svc, svc_data in created_services:
                 if svc_data.unit_values:
                     for uv_data in svc_data.unit_values:
                         uv = QuotationItemServiceUnitValue(
@@ -340,16 +473,20 @@ class QuotationRepository:
                         )
                         db.add(uv)
 
-        db.flush()
-        db.refresh(item)
-
         if thickness_option:
-            QuotationRepository._calculate_item_costs(db, item, thickness_option)
-
-        # Update quotation total
+            costs = QuotationRepository._compute_item_costs(
+                item.length, item.breadth, thickness_option.cost_per_sqft,
+                item.quantity, services_total, item.discount, item.tax_percent,
+            )
+            for key, value in costs.items():
+                setattr(item, key, value)
+
+        # Update quotation total with a SQL-side aggregate instead of
+        # loading every sibling item just to add up their totals
+        db.flush()
         quotation = db.query(Quotation).filter(Quotation.id == data.quotation_id).first()
         if quotation:
-            quotation.total = round(sum(i.total for i in quotation.items), 2)
+            quotation.total = round(QuotationRepository._sum_item_totals(db, data.quotation_id), 2)
 
         db.commit()
         db.refresh(item)
@@ -376,16 +513,19 @@ class QuotationRepository:
 
     @staticmethod
     def update_quotation_item(db: Session, item_id: int, data: QuotationItemUpdate, updated_by: str = None) -> Optional[QuotationItem]:
-        item = db.query(QuotationItem).filter(QuotationItem.id == item_id).first()
-        if not item:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(item, key, value)
         if updated_by:
-            item.updated_by = updated_by
+            update_data['updated_by'] = updated_by
+        if not update_data:
+            return db.query(QuotationItem).filter(QuotationItem.id == item_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE + refresh
+        item = db.execute(
+            update(QuotationItem)
+            .where(QuotationItem.id == item_id)
+            .values(**update_data)
+            .returning(QuotationItem)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(item)
         return item
 
     @staticmethod
@@ -397,10 +537,10 @@ class QuotationRepository:
         db.delete(item)
         db.flush()
 
-        # Recalculate quotation total
+        # Recalculate quotation total in SQL
         quotation = db.query(Quotation).filter(Quotation.id == quotation_id).first()
         if quotation:
-            quotation.total = round(sum(i.total for i in quotation.items), 2)
+            quotation.total = round(QuotationRepository._sum_item_totals(db, quotation_id), 2)
 
         db.commit()
         return True
@@ -411,22 +551,22 @@ class QuotationRepository:
 
     @staticmethod
     def generate_quotation_number(db: Session) -> str:
-        """Generate next quotation number in Q-YYYY-NNN format."""
+        """Generate next quotation number in Q-YYYY-NNN format.
+
+        Increments the per-year row in quotation_counter atomically, so two
+        requests creating quotations at the same time can never be handed
+        the same number (the old MAX-scan approach could).
+        """
         from datetime import date
         year = date.today().year
-        prefix = f"Q-{year}-"
-
-        last = db.query(Quotation).filter(
-            Quotation.quotation_number.like(f"{prefix}%")
-        ).order_by(Quotation.id.desc()).first()
-
-        if last:
-            try:
-                last_num = int(last.quotation_number.split("-")[-1])
-            except (ValueError, IndexError):
-                last_num = 0
-            next_num = last_num + 1
-        else:
-            next_num = 1
 
-        return f"{prefix}{next_num:03d}"
+        seq = db.execute(
+            text(
+                "INSERT INTO quotation_counter (year, last_seq) VALUES (:year, 1) "
+                "ON CONFLICT (year) DO UPDATE SET last_seq = quotation_counter.last_seq + 1 "
+                "RETURNING last_seq"
+            ),
+            {"year": year},
+        ).scalar()
+
+        return f"Q-{year}-{seq:03d}"
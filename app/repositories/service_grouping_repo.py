@@ -3,6 +3,7 @@ Service Grouping Repository
 Data access layer for ServiceGrouping and ServiceGroupingChild entities.
 """
 
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
@@ -65,16 +66,19 @@ class ServiceGroupingRepository:
 
     @staticmethod
     def update_service_grouping(db: Session, grouping_id: int, data: ServiceGroupingUpdate, username: str = None) -> Optional[ServiceGrouping]:
-        grouping = db.query(ServiceGrouping).filter(ServiceGrouping.id == grouping_id).first()
-        if not grouping:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(grouping, key, value)
         if username:
-            grouping.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(ServiceGrouping).filter(ServiceGrouping.id == grouping_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        grouping = db.execute(
+            update(ServiceGrouping)
+            .where(ServiceGrouping.id == grouping_id)
+            .values(**update_data)
+            .returning(ServiceGrouping)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(grouping)
         return grouping
 
     @staticmethod
@@ -112,23 +116,26 @@ class ServiceGroupingRepository:
 
     @staticmethod
     def update_service_grouping_child(db: Session, child_id: int, data: ServiceGroupingChildUpdate, username: str = None) -> Optional[ServiceGroupingChild]:
-        child = db.query(ServiceGroupingChild).filter(ServiceGroupingChild.id == child_id).first()
-        if not child:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(child, key, value)
         if username:
-            child.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(ServiceGroupingChild).filter(ServiceGroupingChild.id == child_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        child = db.execute(
+            update(ServiceGroupingChild)
+            .where(ServiceGroupingChild.id == child_id)
+            .values(**update_data)
+            .returning(ServiceGroupingChild)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(child)
         return child
 
     @staticmethod
     def delete_service_grouping_child(db: Session, child_id: int) -> bool:
-        child = db.query(ServiceGroupingChild).filter(ServiceGroupingChild.id == child_id).first()
-        if not child:
-            return False
-        db.delete(child)
+        # Association row with no children: one DELETE, rowcount covers not-found
+        rows = db.execute(
+            delete(ServiceGroupingChild).where(ServiceGroupingChild.id == child_id)
+        ).rowcount
         db.commit()
-        return True
+        return rows > 0
@@ -3,6 +3,7 @@ Service Repository
 Data access layer for Service and ServiceOption entities.
 """
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 
@@ -75,6 +76,8 @@ class ServiceRepository:
         if not service:
             return None
         update_data = data.model_dump(exclude_unset=True)
+        if not update_data and not username:
+            return service
         for key, value in update_data.items():
             if key == 'service_type' and value is not None:
                 value = value.value if hasattr(value, 'value') else value
@@ -84,7 +87,6 @@ class ServiceRepository:
         if username:
             service.updated_by = username
         db.commit()
-        db.refresh(service)
         return service
 
     @staticmethod
@@ -125,16 +127,19 @@ class ServiceRepository:
 
     @staticmethod
     def update_service_option(db: Session, option_id: int, data: ServiceOptionUpdate, username: str = None) -> Optional[ServiceOption]:
-        option = db.query(ServiceOption).filter(ServiceOption.id == option_id).first()
-        if not option:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(option, key, value)
         if username:
-            option.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(ServiceOption).filter(ServiceOption.id == option_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        option = db.execute(
+            update(ServiceOption)
+            .where(ServiceOption.id == option_id)
+            .values(**update_data)
+            .returning(ServiceOption)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(option)
         return option
 
     @staticmethod
@@ -3,6 +3,7 @@ Unit Repository
 Data access layer for Unit entities.
 """
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -40,16 +41,19 @@ class UnitRepository:
 
     @staticmethod
     def update_unit(db: Session, unit_id: int, data: UnitUpdate, username: str = None) -> Optional[Unit]:
-        unit = db.query(Unit).filter(Unit.id == unit_id).first()
-        if not unit:
-            return None
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(unit, key, value)
         if username:
-            unit.updated_by = username
+            update_data['updated_by'] = username
+        if not update_data:
+            return db.query(Unit).filter(Unit.id == unit_id).first()
+        # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+        unit = db.execute(
+            update(Unit)
+            .where(Unit.id == unit_id)
+            .values(**update_data)
+            .returning(Unit)
+        ).scalar_one_or_none()
         db.commit()
-        db.refresh(unit)
         return unit
 
     @staticmethod
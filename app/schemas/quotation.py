@@ -118,6 +118,7 @@ class QuotationItemResponse(BaseModel):
     quantity: int
     tax_percent: float
     discount: float
+    area_sqft: float = 0
 
     # Cost breakdown
     base_cost: float = 0
@@ -30,8 +30,8 @@ class QuotationService:
         return QuotationRepository.get_quotation_by_number(db, quotation_number)
 
     @staticmethod
-    def get_quotations_by_customer(db: Session, customer_id: int) -> List[Quotation]:
-        return QuotationRepository.get_quotations_by_customer(db, customer_id)
+    def get_quotations_by_customer(db: Session, customer_id: int, skip: int = 0, limit: int = 100) -> List[Quotation]:
+        return QuotationRepository.get_quotations_by_customer(db, customer_id, skip, limit)
 
     @staticmethod
     def get_all_quotations(db: Session, skip: int = 0, limit: int = 100) -> List[Quotation]:
@@ -9,9 +9,13 @@ from zoneinfo import ZoneInfo
 
 IST_TZ_NAME = "Asia/Kolkata"
 
+# ZoneInfo construction hits the tz database; resolve once at import since
+# now_ist runs on every ORM default/onupdate
+_IST = ZoneInfo(IST_TZ_NAME)
+
 
 def get_ist_timezone():
-    return ZoneInfo(IST_TZ_NAME)
+    return _IST
 
 
 def now_ist() -> datetime:
@@ -0,0 +1,44 @@
+"""add quotation_counter table for atomic number generation
+
+Revision ID: 5b6c7d8e9f0a
+Revises: 4a5b6c7d8e9f
+Create Date: 2026-08-28 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b6c7d8e9f0a'
+down_revision: Union[str, Sequence[str], None] = '4a5b6c7d8e9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'quotation_counter',
+        sa.Column('year', sa.Integer(), primary_key=True),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+    )
+    # Seed per-year counters from the highest existing quotation number so
+    # generation continues where the old MAX-scan approach left off.
+    op.execute(
+        """
+        INSERT INTO quotation_counter (year, last_seq)
+        SELECT CAST(split_part(quotation_number, '-', 2) AS INTEGER),
+               MAX(CAST(split_part(quotation_number, '-', 3) AS INTEGER))
+        FROM quotation
+        WHERE quotation_number LIKE 'Q-%-%'
+        GROUP BY 1
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('quotation_counter')
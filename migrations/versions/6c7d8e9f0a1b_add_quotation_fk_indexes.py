@@ -0,0 +1,39 @@
+"""add indexes on quotation foreign keys
+
+Revision ID: 6c7d8e9f0a1b
+Revises: 5b6c7d8e9f0a
+Create Date: 2026-08-28 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c7d8e9f0a1b'
+down_revision: Union[str, Sequence[str], None] = '5b6c7d8e9f0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Foreign keys walked on every quotation read/aggregate path
+    op.create_index('ix_quotation_customer_id', 'quotation', ['customer_id'])
+    op.create_index('ix_quotation_item_quotation_id', 'quotation_item', ['quotation_id'])
+    op.create_index('ix_quotation_item_service_quotation_item_id', 'quotation_item_service', ['quotation_item_id'])
+    op.create_index(
+        'ix_quotation_item_service_unit_value_quotation_item_service_id',
+        'quotation_item_service_unit_value',
+        ['quotation_item_service_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_quotation_item_service_unit_value_quotation_item_service_id', table_name='quotation_item_service_unit_value')
+    op.drop_index('ix_quotation_item_service_quotation_item_id', table_name='quotation_item_service')
+    op.drop_index('ix_quotation_item_quotation_id', table_name='quotation_item')
+    op.drop_index('ix_quotation_customer_id', table_name='quotation')
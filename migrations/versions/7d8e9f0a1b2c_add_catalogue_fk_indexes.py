@@ -0,0 +1,35 @@
+"""add indexes on catalogue foreign keys
+
+Revision ID: 7d8e9f0a1b2c
+Revises: 6c7d8e9f0a1b
+Create Date: 2026-08-28 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d8e9f0a1b2c'
+down_revision: Union[str, Sequence[str], None] = '6c7d8e9f0a1b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Foreign keys walked by the door-type/service/grouping eager loaders
+    op.create_index('ix_service_option_service_id', 'service_option', ['service_id'])
+    op.create_index('ix_service_grouping_child_grouping_id', 'service_grouping_child', ['grouping_id'])
+    op.create_index('ix_door_type_thickness_option_door_type_id', 'door_type_thickness_option', ['door_type_id'])
+    op.create_index('ix_door_type_service_door_type_id', 'door_type_service', ['door_type_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_door_type_service_door_type_id', table_name='door_type_service')
+    op.drop_index('ix_door_type_thickness_option_door_type_id', table_name='door_type_thickness_option')
+    op.drop_index('ix_service_grouping_child_grouping_id', table_name='service_grouping_child')
+    op.drop_index('ix_service_option_service_id', table_name='service_option')